@@ -4,28 +4,139 @@ Simple DTN (Delay/Disruption Tolerant Network) Implementation
 Implements basic Bundle Protocol with Store-and-Forward capability
 """
 
+import array
+import asyncio
 import json
 import time
+import secrets
 import socket
 import threading
 import queue
 import os
-import hashlib
 import logging
+import mmap
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import pickle
+import struct
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # the node stays runnable on a bare stdlib image
+    np = None
+
+try:
+    import lz4.frame
+except ImportError:  # fall back to stdlib zlib for payload compression
+    lz4 = None
 
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
+# Fixed part of the bundle metadata segment: bundle id, creation
+# timestamp, lifetime, priority, hop count, forwarded-by entry count.
+# Variable-length strings (source, destination, forwarded-by) follow as
+# u16-length-prefixed UTF-8.
+_HEADER = struct.Struct('!16sdIBHH')
+
+# Escape hatch for talking to nodes running the old pickle format
+_LEGACY_PICKLE = os.environ.get('DTN_LEGACY_PICKLE') == '1'
+
+def _dumps(bundle: 'Bundle') -> Tuple[bytes, bytes]:
+    """Serialize a bundle into (metadata, payload) segments.
+
+    The metadata is a compact packed header rather than a pickle, so
+    deserializing network input never runs pickle.loads; the payload
+    still travels as its own framed segment without an extra copy.
+    """
+    if _LEGACY_PICKLE:
+        buffers: List[pickle.PickleBuffer] = []
+        meta = pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL,
+                            buffer_callback=buffers.append)
+        return meta, buffers[0].raw() if buffers else b''
+
+    parts = [_HEADER.pack(bundle.bundle_id.encode('ascii'),
+                          bundle.creation_timestamp,
+                          bundle.lifetime,
+                          bundle.priority,
+                          bundle.hop_count,
+                          len(bundle.forwarded_by))]
+    for name in (bundle.source, bundle.destination, *bundle.forwarded_by):
+        encoded = name.encode('utf-8')
+        parts.append(len(encoded).to_bytes(2, 'big'))
+        parts.append(encoded)
+    return b''.join(parts), bundle.payload
+
+def _loads(meta: bytes, payload: bytes) -> 'Bundle':
+    """Reconstruct a bundle from (metadata, payload) segments"""
+    if _LEGACY_PICKLE:
+        return pickle.loads(meta, buffers=[payload])
+
+    view = memoryview(meta)
+    bundle_id, ts, lifetime, priority, hops, n_names = _HEADER.unpack_from(view)
+    names = []
+    offset = _HEADER.size
+    for _ in range(n_names + 2):  # source, destination, forwarded-by
+        length = int.from_bytes(view[offset:offset + 2], 'big')
+        offset += 2
+        names.append(bytes(view[offset:offset + length]).decode('utf-8'))
+        offset += length
+
+    bundle = Bundle.__new__(Bundle)
+    bundle.bundle_id = bundle_id.decode('ascii').rstrip('\x00')
+    bundle.source = names[0]
+    bundle.destination = names[1]
+    bundle.payload = payload
+    bundle.creation_timestamp = ts
+    bundle.lifetime = lifetime
+    bundle.priority = priority
+    bundle.hop_count = hops
+    bundle.forwarded_by = names[2:]
+    return bundle
+
+# Payload segments above this size are compressed before they hit the
+# wire or the disk; the codec byte in the frame records the choice
+PAYLOAD_COMPRESS_MIN = 512
+
+_CODEC_RAW = 0
+_CODEC_LZ4 = 1
+_CODEC_ZLIB = 2
+
+def _pack_payload(payload: bytes) -> Tuple[int, bytes]:
+    """Compress a payload segment when it is large enough to pay off"""
+    if len(payload) > PAYLOAD_COMPRESS_MIN:
+        if lz4 is not None:
+            return _CODEC_LZ4, lz4.frame.compress(bytes(payload),
+                                                  compression_level=0)
+        return _CODEC_ZLIB, zlib.compress(bytes(payload), 1)
+    return _CODEC_RAW, payload
+
+def _unpack_payload(codec: int, payload: bytes) -> bytes:
+    """Undo _pack_payload according to the frame's codec byte"""
+    if codec == _CODEC_LZ4:
+        if lz4 is None:
+            raise ValueError("received an lz4 payload but lz4 is not installed")
+        return lz4.frame.decompress(payload)
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(payload)
+    return payload
+
+def _bundle_from_state(state: dict) -> 'Bundle':
+    """Rebuild a Bundle from its pickled state (see Bundle.__reduce_ex__)"""
+    bundle = Bundle.__new__(Bundle)
+    state['payload'] = bytes(state['payload'])
+    bundle.__dict__.update(state)
+    return bundle
+
 class Bundle:
     """DTN Bundle - the basic unit of data transfer"""
     def __init__(self, source: str, destination: str, payload: bytes, 
                  lifetime: int = 3600, priority: int = 1):
-        self.bundle_id = hashlib.sha256(
-            f"{source}{destination}{time.time()}".encode()
-        ).hexdigest()[:16]
+        # Random 16-hex-char id; no need for a cryptographic hash here
+        self.bundle_id = secrets.token_hex(8)
         self.source = source
         self.destination = destination
         self.payload = payload
@@ -35,9 +146,23 @@ class Bundle:
         self.hop_count = 0
         self.forwarded_by = []
         
-    def is_expired(self) -> bool:
-        """Check if bundle has exceeded its lifetime"""
-        return time.time() - self.creation_timestamp > self.lifetime
+    def __reduce_ex__(self, protocol):
+        """Expose the payload as an out-of-band buffer under protocol 5"""
+        if protocol >= 5:
+            state = self.__dict__.copy()
+            state['payload'] = pickle.PickleBuffer(self.payload)
+            return (_bundle_from_state, (state,))
+        return super().__reduce_ex__(protocol)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check if bundle has exceeded its lifetime.
+
+        Callers sweeping many bundles pass one time.time() reading
+        instead of paying a clock call per bundle.
+        """
+        if now is None:
+            now = time.time()
+        return now - self.creation_timestamp > self.lifetime
     
     def add_hop(self, node_id: str):
         """Track forwarding path"""
@@ -50,7 +175,7 @@ class Bundle:
             'bundle_id': self.bundle_id,
             'source': self.source,
             'destination': self.destination,
-            'payload': self.payload.decode('utf-8', errors='replace'),
+            'payload': bytes(self.payload).decode('utf-8', errors='replace'),
             'creation_timestamp': self.creation_timestamp,
             'lifetime': self.lifetime,
             'priority': self.priority,
@@ -59,31 +184,176 @@ class Bundle:
         }
 
 class BundleStore:
-    """Persistent storage for bundles (Store-and-Forward)"""
+    """Persistent storage for bundles (Store-and-Forward).
+
+    Bundles are indexed by destination so get_bundles_for touches only
+    the rows of the requested destination instead of scanning the whole
+    store; the index is maintained on every insert and removal.
+    """
+
+    # Group-commit tuning: flush at most this many bundles, or whatever
+    # arrived within this window, with a single directory fsync
+    WRITE_BATCH_SIZE = 32
+    WRITE_BATCH_TIMEOUT = 0.005  # seconds
+
+    # Initial length of the timestamp/lifetime columns (numpy path)
+    INITIAL_CAPACITY = 1024
+
     def __init__(self, storage_path: str = "/tmp/dtn_bundles"):
         self.storage_path = storage_path
         self.bundles: Dict[str, Bundle] = {}
         self.lock = threading.Lock()
+
+        # Durability of bundle writes (from environment):
+        #   GROUP - batch many writes behind one directory fsync (default)
+        #   SYNC  - fdatasync every bundle file before store() returns
+        #   ASYNC - no explicit flushing; fastest, loses bundles on crash
+        self.durability = os.environ.get('DTN_DURABILITY', 'GROUP').upper()
+
+        # Struct-of-arrays view of the store: creation timestamps and
+        # lifetimes live in parallel columns so expiry sweeps scan
+        # contiguous memory instead of chasing Bundle objects. Rows are
+        # recycled through a free list; a freed row gets ts=inf so it
+        # never matches an expiry comparison.
+        if np is not None:
+            self._ts = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+            self._lt = np.empty(self.INITIAL_CAPACITY, dtype=np.int32)
+        else:
+            self._ts = array.array('d')
+            self._lt = array.array('q')
+        self._objs: List[Optional[Bundle]] = []
+        self._row: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._used = 0
+        self._dest_index: Dict[str, Set[int]] = {}
+
         os.makedirs(storage_path, exist_ok=True)
         self.load_bundles()
-    
+
+        # Writer thread batches disk writes so many concurrent store()
+        # calls share one fsync instead of paying one flush each
+        self._write_q = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop)
+        self._writer_thread.daemon = True
+        self._writer_thread.start()
+
+    def _path_for(self, bundle_id: str) -> str:
+        """Backing file path for a bundle id"""
+        # Hot path: plain formatting skips os.path.join's normalization
+        return f"{self.storage_path}/{bundle_id}.bundle"
+
+    def _insert_locked(self, bundle: Bundle) -> bool:
+        """Add a bundle to the in-memory table and columns (lock held)"""
+        if bundle.bundle_id in self.bundles:
+            return False
+        self.bundles[bundle.bundle_id] = bundle
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._objs[row] = bundle
+        else:
+            row = self._used
+            self._used += 1
+            if np is not None and row == len(self._ts):
+                self._ts = np.resize(self._ts, 2 * len(self._ts))
+                self._lt = np.resize(self._lt, 2 * len(self._lt))
+            if np is None:
+                self._ts.append(0.0)
+                self._lt.append(0)
+            self._objs.append(bundle)
+        self._ts[row] = bundle.creation_timestamp
+        self._lt[row] = bundle.lifetime
+        self._row[bundle.bundle_id] = row
+        self._dest_index.setdefault(bundle.destination, set()).add(row)
+        return True
+
+    def _evict_locked(self, bundle_id: str) -> Optional[Bundle]:
+        """Drop a bundle from the table and recycle its row (lock held)"""
+        bundle = self.bundles.pop(bundle_id, None)
+        if bundle is None:
+            return None
+        row = self._row.pop(bundle_id)
+        self._objs[row] = None
+        self._ts[row] = float('inf')  # freed rows never look expired
+        self._lt[row] = 0
+        self._free_rows.append(row)
+        rows = self._dest_index.get(bundle.destination)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self._dest_index[bundle.destination]
+        return bundle
+
     def store(self, bundle: Bundle) -> bool:
         """Store bundle persistently"""
         with self.lock:
-            if bundle.bundle_id in self.bundles:
+            # Update memory first so retrieve() sees the bundle immediately
+            if not self._insert_locked(bundle):
                 return False  # Duplicate
-            
-            self.bundles[bundle.bundle_id] = bundle
-            # Persist to disk
-            bundle_file = os.path.join(self.storage_path, f"{bundle.bundle_id}.bundle")
-            try:
-                with open(bundle_file, 'wb') as f:
-                    pickle.dump(bundle, f)
-                logger.info(f"Stored bundle {bundle.bundle_id} for {bundle.destination}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to store bundle: {e}")
-                return False
+
+        # Hand the disk write to the group-commit writer and wait for
+        # the batch it lands in to be flushed
+        bundle_file = self._path_for(bundle.bundle_id)
+        meta, payload = _dumps(bundle)
+        codec, payload = _pack_payload(payload)
+        blob = b''.join((len(meta).to_bytes(8, 'big'), meta, bytes((codec,)),
+                         len(payload).to_bytes(8, 'big'), payload))
+        latch = threading.Event()
+        errors: List[Exception] = []
+        self._write_q.put((bundle_file, blob, latch, errors))
+        latch.wait()
+
+        if errors:
+            logger.error("Failed to store bundle: %s", errors[0])
+            with self.lock:
+                self._evict_locked(bundle.bundle_id)
+            return False
+
+        logger.info("Stored bundle %s for %s", bundle.bundle_id, bundle.destination)
+        return True
+
+    def _writer_loop(self):
+        """Drain queued bundle writes in batches, one fsync per batch"""
+        sync_each = self.durability == 'SYNC'
+        sync_batch = self.durability != 'ASYNC'
+        while True:
+            batch = [self._write_q.get()]
+            deadline = time.monotonic() + self.WRITE_BATCH_TIMEOUT
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            for bundle_file, blob, latch, errors in batch:
+                # Write-then-rename so a crash mid-write never leaves a
+                # truncated bundle file behind
+                tmp_file = bundle_file + '.tmp'
+                try:
+                    with open(tmp_file, 'wb') as f:
+                        f.write(blob)
+                        if sync_each:
+                            os.fdatasync(f.fileno())
+                    os.replace(tmp_file, bundle_file)
+                except Exception as e:
+                    errors.append(e)
+
+            # Single flush covers every rename in this batch
+            if sync_batch:
+                try:
+                    dir_fd = os.open(self.storage_path, os.O_RDONLY)
+                    try:
+                        os.fsync(dir_fd)
+                    finally:
+                        os.close(dir_fd)
+                except OSError as e:
+                    logger.error("Failed to sync bundle storage: %s", e)
+
+            for _, _, latch, _ in batch:
+                latch.set()
     
     def retrieve(self, bundle_id: str) -> Optional[Bundle]:
         """Retrieve a specific bundle"""
@@ -91,80 +361,153 @@ class BundleStore:
             return self.bundles.get(bundle_id)
     
     def get_bundles_for(self, destination: str) -> List[Bundle]:
-        """Get all bundles for a specific destination"""
+        """Get all unexpired bundles for a specific destination"""
         with self.lock:
-            return [b for b in self.bundles.values() 
-                   if b.destination == destination and not b.is_expired()]
-    
+            rows = self._dest_index.get(destination)
+            if not rows:
+                return []
+            now = time.time()
+            if np is not None:
+                idxs = np.fromiter(rows, dtype=np.int64, count=len(rows))
+                mask = (now - self._ts[idxs]) <= self._lt[idxs]
+                return [self._objs[i] for i in idxs[mask]]
+            return [self._objs[i] for i in rows
+                    if now - self._ts[i] <= self._lt[i]]
+
     def remove(self, bundle_id: str):
         """Remove delivered or expired bundle"""
         with self.lock:
-            if bundle_id in self.bundles:
-                del self.bundles[bundle_id]
-                bundle_file = os.path.join(self.storage_path, f"{bundle_id}.bundle")
-                if os.path.exists(bundle_file):
-                    os.remove(bundle_file)
-    
+            bundle = self._evict_locked(bundle_id)
+        if bundle is not None:
+            # EAFP: one unlink syscall instead of a stat-then-remove pair
+            try:
+                os.unlink(self._path_for(bundle_id))
+            except FileNotFoundError:
+                pass
+
     def cleanup_expired(self):
-        """Remove expired bundles"""
+        """Remove expired bundles with one pass over the time columns"""
         with self.lock:
-            expired = [bid for bid, b in self.bundles.items() if b.is_expired()]
-            for bid in expired:
-                logger.info(f"Removing expired bundle {bid}")
-                self.remove(bid)
+            now = time.time()
+            if np is not None:
+                used = self._used
+                rows = np.nonzero(now - self._ts[:used] > self._lt[:used])[0]
+                expired = [self._objs[i].bundle_id for i in rows]
+            else:
+                expired = [bid for bid, row in self._row.items()
+                           if now - self._ts[row] > self._lt[row]]
+        for bid in expired:
+            logger.info("Removing expired bundle %s", bid)
+            self.remove(bid)
     
+    def _load_one(self, filepath: str) -> 'Bundle':
+        """Parse one bundle file through mmap.
+
+        The file is mapped read-only and parsed in place, so nothing is
+        copied into user space; an uncompressed payload stays a
+        memoryview over the mapping (which the view keeps alive).
+        """
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            mapped = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        view = memoryview(mapped)
+        meta_size = int.from_bytes(view[:8], 'big')
+        codec = view[8 + meta_size]
+        payload = _unpack_payload(codec, view[17 + meta_size:])
+        bundle = _loads(view[8:8 + meta_size], payload)
+        if not isinstance(payload, memoryview):
+            # Payload was decompressed into fresh bytes; the mapping
+            # has nothing left referencing it
+            view.release()
+            mapped.close()
+        return bundle
+
     def load_bundles(self):
-        """Load bundles from disk on startup"""
-        if not os.path.exists(self.storage_path):
+        """Load bundles from disk on startup.
+
+        Files are parsed on a thread pool: each worker blocks on its own
+        I/O, so cold-start time scales with disk parallelism instead of
+        linearly with the number of stored bundles.
+        """
+        try:
+            with os.scandir(self.storage_path) as entries:
+                files = [e.path for e in entries if e.name.endswith('.bundle')]
+        except FileNotFoundError:
             return
-        
-        for filename in os.listdir(self.storage_path):
-            if filename.endswith('.bundle'):
-                try:
-                    filepath = os.path.join(self.storage_path, filename)
-                    with open(filepath, 'rb') as f:
-                        bundle = pickle.load(f)
-                        if not bundle.is_expired():
-                            self.bundles[bundle.bundle_id] = bundle
-                            logger.info(f"Loaded bundle {bundle.bundle_id}")
-                except Exception as e:
-                    logger.error(f"Failed to load bundle {filename}: {e}")
+        if not files:
+            return
+
+        def load_one(filepath: str) -> Optional[Bundle]:
+            try:
+                return self._load_one(filepath)
+            except Exception as e:
+                logger.error("Failed to load bundle %s: %s",
+                             os.path.basename(filepath), e)
+                return None
+
+        now = time.time()
+        workers = min(32, (os.cpu_count() or 4) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for bundle in pool.map(load_one, files):
+                if bundle is not None and not bundle.is_expired(now):
+                    with self.lock:
+                        self._insert_locked(bundle)
+                    logger.info("Loaded bundle %s", bundle.bundle_id)
+
+# Metric counter slots for DTNNode._metrics; indexed array writes are
+# cheaper than dict updates on the per-bundle paths
+_M_RECEIVED, _M_FORWARDED, _M_DELIVERED, _M_EXPIRED = range(4)
 
 class DTNNode:
     """DTN Node with Store-and-Forward capability"""
+
+    # Maximum bundles drained from the forward queue per iteration
+    FORWARD_BATCH_SIZE = 64
+
     def __init__(self, node_id: str, host: str = '0.0.0.0', port: int = 4556):
         self.node_id = node_id
         self.host = host
         self.port = port
         self.store = BundleStore(f"/tmp/dtn_bundles_{node_id}")
         self.neighbors: Dict[str, Tuple[str, int]] = {}
+        self._conn_pool: Dict[Tuple[str, int], socket.socket] = {}
+        self._conn_lock = threading.Lock()
         self.running = False
         self.server_thread = None
-        self.forward_queue = queue.Queue()
-        self.metrics = {
-            'bundles_received': 0,
-            'bundles_forwarded': 0,
-            'bundles_delivered': 0,
-            'bundles_expired': 0
-        }
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        # Forward queue partitioned by destination neighbor ('*' for
+        # bundles routed indirectly): producers append to plain deques
+        # (atomic under the GIL) and wake the forwarder via one event,
+        # so concurrent handlers never contend on a queue mutex
+        self._fwd: Dict[str, deque] = {}
+        self._fwd_event = threading.Event()
+        self._delivery_log_lock = threading.Lock()
+        self._metrics = array.array('Q', [0] * 4)
         
         # Space communication delay simulation (from environment)
         self.send_delay_ms = int(os.environ.get('DTN_SEND_DELAY_MS', '0'))
         self.recv_delay_ms = int(os.environ.get('DTN_RECV_DELAY_MS', '0'))
         if self.send_delay_ms > 0:
-            logger.info(f"Send delay: {self.send_delay_ms}ms")
+            logger.info("Send delay: %dms", self.send_delay_ms)
         if self.recv_delay_ms > 0:
-            logger.info(f"Receive delay: {self.recv_delay_ms}ms")
+            logger.info("Receive delay: %dms", self.recv_delay_ms)
         
     def add_neighbor(self, node_id: str, host: str, port: int):
         """Add a neighboring node for routing"""
         self.neighbors[node_id] = (host, port)
-        logger.info(f"Added neighbor: {node_id} at {host}:{port}")
+        logger.info("Added neighbor: %s at %s:%d", node_id, host, port)
     
     def start(self):
         """Start the DTN node"""
         self.running = True
-        
+
+        # Bounded worker pool for incoming connections; spawning a
+        # fresh thread per accept is costly under bundle bursts
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=32, thread_name_prefix=f"dtn-io-{self.node_id}")
+
         # Start server thread
         self.server_thread = threading.Thread(target=self._run_server)
         self.server_thread.daemon = True
@@ -180,169 +523,293 @@ class DTNNode:
         cleanup_thread.daemon = True
         cleanup_thread.start()
         
-        logger.info(f"DTN Node {self.node_id} started on {self.host}:{self.port}")
+        logger.info("DTN Node %s started on %s:%d", self.node_id, self.host, self.port)
     
     def stop(self):
         """Stop the DTN node"""
         self.running = False
-        logger.info(f"DTN Node {self.node_id} stopped")
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+        with self._conn_lock:
+            for sock in self._conn_pool.values():
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+            self._conn_pool.clear()
+        logger.info("DTN Node %s stopped", self.node_id)
     
     def send_bundle(self, destination: str, payload: bytes, lifetime: int = 3600):
         """Create and send a new bundle"""
         bundle = Bundle(self.node_id, destination, payload, lifetime)
         self.store.store(bundle)
-        self.forward_queue.put(bundle)
-        logger.info(f"Created bundle {bundle.bundle_id} for {destination}")
+        self._enqueue_forward(bundle)
+        logger.info("Created bundle %s for %s", bundle.bundle_id, destination)
         return bundle.bundle_id
     
     def _run_server(self):
-        """TCP server to receive bundles"""
-        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server_socket.bind((self.host, self.port))
-        server_socket.listen(5)
-        server_socket.settimeout(1.0)
-        
-        while self.running:
-            try:
-                client_socket, addr = server_socket.accept()
-                threading.Thread(
-                    target=self._handle_connection, 
-                    args=(client_socket,)
-                ).start()
-            except socket.timeout:
-                continue
-            except Exception as e:
-                logger.error(f"Server error: {e}")
-        
-        server_socket.close()
+        """Run the asyncio bundle server in the server thread"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._serve())
+        except Exception as e:
+            logger.error("Server error: %s", e)
+        finally:
+            loop.close()
+
+    async def _serve(self):
+        """Accept bundle connections until the node is stopped"""
+        server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port)
+        async with server:
+            while self.running:
+                await asyncio.sleep(0.5)
+            server.close()
+            await server.wait_closed()
     
-    def _handle_connection(self, client_socket: socket.socket):
-        """Handle incoming bundle"""
+    def _recv_exact(self, sock: socket.socket, size: int) -> bytes:
+        """Receive exactly size bytes from a socket.
+
+        Fills a preallocated buffer with recv_into so nothing is
+        reallocated or recopied as chunks arrive.
+        """
+        buf = bytearray(size)
+        view = memoryview(buf)
+        offset = 0
+        while offset < size:
+            n = sock.recv_into(view[offset:], size - offset)
+            if not n:
+                return bytes(view[:offset])  # peer closed early
+            offset += n
+        return bytes(buf)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        """Handle incoming bundles on a (possibly long-lived) connection"""
+        loop = asyncio.get_running_loop()
         try:
-            # Receive bundle size
-            size_data = client_socket.recv(8)
-            if not size_data:
-                return
-            
-            bundle_size = int.from_bytes(size_data, 'big')
-            
-            # Receive bundle data
-            bundle_data = b''
-            while len(bundle_data) < bundle_size:
-                chunk = client_socket.recv(min(4096, bundle_size - len(bundle_data)))
-                if not chunk:
+            while True:
+                # Receive batch header; EOF here means the peer closed
+                # its pooled connection
+                try:
+                    count_data = await reader.readexactly(8)
+                except asyncio.IncompleteReadError:
                     break
-                bundle_data += chunk
-            
-            # Apply receive delay for space communication simulation
-            if self.recv_delay_ms > 0:
-                delay_s = self.recv_delay_ms / 1000.0
-                logger.debug(f"Applying {self.recv_delay_ms}ms receive delay")
-                time.sleep(delay_s)
-            
-            # Deserialize bundle
-            bundle = pickle.loads(bundle_data)
-            bundle.add_hop(self.node_id)
-            
-            self.metrics['bundles_received'] += 1
-            logger.info(f"Received bundle {bundle.bundle_id} from {bundle.source}")
-            
-            # Check if this node is the destination
-            if bundle.destination == self.node_id:
-                self._deliver_bundle(bundle)
-            else:
-                # Store and forward
-                if self.store.store(bundle):
-                    self.forward_queue.put(bundle)
-            
-            # Send acknowledgment
-            client_socket.send(b'ACK')
-            
+                count = int.from_bytes(count_data, 'big')
+
+                frames = []
+                for _ in range(count):
+                    # Receive metadata segment
+                    size_data = await reader.readexactly(8)
+                    meta = await reader.readexactly(int.from_bytes(size_data, 'big'))
+
+                    # Receive codec byte and payload segment
+                    codec = (await reader.readexactly(1))[0]
+                    size_data = await reader.readexactly(8)
+                    payload = await reader.readexactly(int.from_bytes(size_data, 'big'))
+                    frames.append((meta, codec, payload))
+
+                # Apply receive delay for space communication simulation.
+                # The batch crossed the link as one transmission, so it
+                # pays the delay once, not once per bundle
+                if self.recv_delay_ms > 0:
+                    delay_s = self.recv_delay_ms / 1000.0
+                    logger.debug("Applying %dms receive delay", self.recv_delay_ms)
+                    await asyncio.sleep(delay_s)
+
+                for meta, codec, payload in frames:
+                    # Deserialize bundle
+                    bundle = _loads(meta, _unpack_payload(codec, payload))
+                    bundle.add_hop(self.node_id)
+
+                    self._metrics[_M_RECEIVED] += 1
+                    logger.info("Received bundle %s from %s", bundle.bundle_id, bundle.source)
+
+                    # Store/deliver does blocking disk work, so it runs
+                    # on the worker pool instead of the event loop
+                    await loop.run_in_executor(
+                        self._io_pool, self._process_bundle, bundle)
+
+                # Acknowledge the whole batch at once
+                writer.write(b'ACK' + count.to_bytes(4, 'big'))
+                await writer.drain()
+
         except Exception as e:
-            logger.error(f"Error handling connection: {e}")
+            logger.error("Error handling connection: %s", e)
         finally:
-            client_socket.close()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    def _process_bundle(self, bundle: Bundle):
+        """Deliver or store-and-forward one received bundle"""
+        # Check if this node is the destination
+        if bundle.destination == self.node_id:
+            self._deliver_bundle(bundle)
+        else:
+            # Store and forward
+            if self.store.store(bundle):
+                self._enqueue_forward(bundle)
     
+    def _route_bundle(self, bundle: Bundle) -> Optional[Tuple[str, int]]:
+        """Pick the next hop for a bundle, or None if no neighbor fits"""
+        # Direct delivery if neighbor
+        if bundle.destination in self.neighbors:
+            return self.neighbors[bundle.destination]
+        # Otherwise, forward to any neighbor that has not seen it yet
+        for neighbor_id, addr in self.neighbors.items():
+            if neighbor_id not in bundle.forwarded_by:
+                return addr
+        return None
+
+    def _enqueue_forward(self, bundle: Bundle):
+        """Queue a bundle for forwarding on its neighbor partition"""
+        key = bundle.destination if bundle.destination in self.neighbors else '*'
+        partition = self._fwd.get(key)
+        if partition is None:
+            partition = self._fwd.setdefault(key, deque())
+        partition.append(bundle)
+        self._fwd_event.set()
+
     def _forward_bundles(self):
-        """Forward bundles to appropriate neighbors"""
+        """Forward bundles to appropriate neighbors in batches"""
         while self.running:
             try:
-                # Check for bundles to forward
-                bundle = self.forward_queue.get(timeout=1)
-                
-                if bundle.is_expired():
-                    self.metrics['bundles_expired'] += 1
-                    self.store.remove(bundle.bundle_id)
+                if not self._fwd_event.wait(timeout=1):
                     continue
-                
-                # Simple routing: try to forward to destination or any neighbor
-                success = False
-                
-                # Direct delivery if neighbor
-                if bundle.destination in self.neighbors:
-                    host, port = self.neighbors[bundle.destination]
-                    if self._send_to_node(bundle, host, port):
-                        success = True
-                        self.metrics['bundles_forwarded'] += 1
-                
-                # Otherwise, forward to any available neighbor
-                if not success:
-                    for neighbor_id, (host, port) in self.neighbors.items():
-                        if neighbor_id not in bundle.forwarded_by:
-                            if self._send_to_node(bundle, host, port):
-                                success = True
-                                self.metrics['bundles_forwarded'] += 1
-                                break
-                
-                if success:
-                    self.store.remove(bundle.bundle_id)
-                else:
+                self._fwd_event.clear()
+
+                # Drain a batch across the partitions
+                batch: List[Bundle] = []
+                for partition in list(self._fwd.values()):
+                    while len(batch) < self.FORWARD_BATCH_SIZE:
+                        try:
+                            batch.append(partition.popleft())
+                        except IndexError:
+                            break
+                if not batch:
+                    continue
+                # Leftovers beyond the batch limit: keep the forwarder awake
+                if any(self._fwd.values()):
+                    self._fwd_event.set()
+
+                # Group live bundles by chosen next hop; one clock
+                # reading covers the whole batch
+                now = time.time()
+                groups: Dict[Tuple[str, int], List[Bundle]] = {}
+                failed: List[Bundle] = []
+                for bundle in batch:
+                    if bundle.is_expired(now):
+                        self._metrics[_M_EXPIRED] += 1
+                        self.store.remove(bundle.bundle_id)
+                        continue
+                    target = self._route_bundle(bundle)
+                    if target is None:
+                        failed.append(bundle)
+                    else:
+                        groups.setdefault(target, []).append(bundle)
+
+                # One pipelined send per neighbor
+                for (host, port), bundles in groups.items():
+                    if self._send_bundles_batch(bundles, host, port):
+                        for bundle in bundles:
+                            self._metrics[_M_FORWARDED] += 1
+                            self.store.remove(bundle.bundle_id)
+                    else:
+                        failed.extend(bundles)
+
+                if failed:
                     # Retry later
                     time.sleep(5)
-                    self.forward_queue.put(bundle)
-                    
-            except queue.Empty:
-                continue
+                    for bundle in failed:
+                        self._enqueue_forward(bundle)
+
             except Exception as e:
-                logger.error(f"Forwarding error: {e}")
+                logger.error("Forwarding error: %s", e)
     
+    def _get_conn(self, host: str, port: int) -> socket.socket:
+        """Get (or lazily open) the pooled connection to a neighbor"""
+        key = (host, port)
+        sock = self._conn_pool.get(key)
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(5)
+            # Bundles are bulk transfers: enlarge the send buffer and
+            # leave Nagle enabled so small frames coalesce on the link
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)
+            sock.connect((host, port))
+            self._conn_pool[key] = sock
+        return sock
+
+    def _drop_conn(self, host: str, port: int):
+        """Discard a pooled connection after an error"""
+        sock = self._conn_pool.pop((host, port), None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
     def _send_to_node(self, bundle: Bundle, host: str, port: int) -> bool:
-        """Send bundle to another node"""
+        """Send a single bundle to another node"""
+        return self._send_bundles_batch([bundle], host, port)
+
+    def _send_bundles_batch(self, bundles: List[Bundle], host: str, port: int) -> bool:
+        """Send a batch of bundles to a neighbor over the pooled connection"""
         try:
-            # Apply send delay for space communication simulation
+            # Apply send delay for space communication simulation; the
+            # batch traverses the link as one transmission
             if self.send_delay_ms > 0:
                 delay_s = self.send_delay_ms / 1000.0
-                logger.debug(f"Applying {self.send_delay_ms}ms send delay")
+                logger.debug("Applying %dms send delay", self.send_delay_ms)
                 time.sleep(delay_s)
-            
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect((host, port))
-            
-            # Serialize bundle
-            bundle_data = pickle.dumps(bundle)
-            
-            # Send size then data
-            sock.send(len(bundle_data).to_bytes(8, 'big'))
-            sock.send(bundle_data)
-            
-            # Wait for ACK
-            ack = sock.recv(3)
-            sock.close()
-            
-            if ack == b'ACK':
-                logger.info(f"Forwarded bundle {bundle.bundle_id} to {host}:{port}")
+
+            # Frame: [8B count] then size-prefixed metadata + payload
+            # segments for each bundle
+            parts = [len(bundles).to_bytes(8, 'big')]
+            for bundle in bundles:
+                meta, payload = _dumps(bundle)
+                codec, payload = _pack_payload(payload)
+                parts.extend((len(meta).to_bytes(8, 'big'), meta, bytes((codec,)),
+                              len(payload).to_bytes(8, 'big'), payload))
+            frame = b''.join(parts)
+
+            expected_ack = b'ACK' + len(bundles).to_bytes(4, 'big')
+
+            with self._conn_lock:
+                ack = b''
+                # One retry: a pooled connection may have gone stale
+                # since the last send
+                for attempt in range(2):
+                    try:
+                        sock = self._get_conn(host, port)
+                        sock.sendall(frame)
+                        ack = self._recv_exact(sock, len(expected_ack))
+                        if ack:
+                            break
+                        self._drop_conn(host, port)
+                    except OSError:
+                        self._drop_conn(host, port)
+                        if attempt == 1:
+                            raise
+
+            if ack == expected_ack:
+                for bundle in bundles:
+                    logger.info("Forwarded bundle %s to %s:%d", bundle.bundle_id, host, port)
                 return True
-            
+
         except Exception as e:
-            logger.debug(f"Failed to send to {host}:{port}: {e}")
-        
+            logger.debug("Failed to send to %s:%d: %s", host, port, e)
+
         return False
     
     def _deliver_bundle(self, bundle: Bundle):
         """Deliver bundle to local application"""
-        self.metrics['bundles_delivered'] += 1
+        self._metrics[_M_DELIVERED] += 1
         
         # Calculate end-to-end delay
         e2e_delay = time.time() - bundle.creation_timestamp
@@ -353,7 +820,7 @@ class DTNNode:
             'bundle_id': bundle.bundle_id,
             'source': bundle.source,
             'destination': bundle.destination,
-            'payload': bundle.payload.decode('utf-8', errors='replace'),
+            'payload': bytes(bundle.payload).decode('utf-8', errors='replace'),
             'e2e_delay': e2e_delay,
             'hop_count': bundle.hop_count,
             'path': bundle.forwarded_by,
@@ -361,24 +828,19 @@ class DTNNode:
         }
         
         try:
-            # Append to JSON log
-            if os.path.exists(delivery_log):
-                with open(delivery_log, 'r') as f:
-                    deliveries = json.load(f)
-            else:
-                deliveries = []
-            
-            deliveries.append(delivery_data)
-            
-            with open(delivery_log, 'w') as f:
-                json.dump(deliveries, f, indent=2)
-            
-            logger.info(f"DELIVERED: Bundle {bundle.bundle_id} from {bundle.source}")
-            logger.info(f"  Payload: {bundle.payload.decode('utf-8', errors='replace')[:50]}")
-            logger.info(f"  E2E Delay: {e2e_delay:.2f}s, Hops: {bundle.hop_count}")
+            # Append one JSON line per delivery; rewriting the whole log
+            # grew quadratically and raced between concurrent deliveries
+            with self._delivery_log_lock:
+                with open(delivery_log, 'a', buffering=1 << 16) as f:
+                    f.write(json.dumps(delivery_data, separators=(',', ':')) + '\n')
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("DELIVERED: Bundle %s from %s", bundle.bundle_id, bundle.source)
+                logger.info("  Payload: %s", bytes(bundle.payload).decode('utf-8', errors='replace')[:50])
+                logger.info("  E2E Delay: %.2fs, Hops: %d", e2e_delay, bundle.hop_count)
             
         except Exception as e:
-            logger.error(f"Failed to log delivery: {e}")
+            logger.error("Failed to log delivery: %s", e)
     
     def _cleanup_expired(self):
         """Periodically clean up expired bundles"""
@@ -391,7 +853,10 @@ class DTNNode:
         return {
             'node_id': self.node_id,
             'stored_bundles': len(self.store.bundles),
-            **self.metrics
+            'bundles_received': self._metrics[_M_RECEIVED],
+            'bundles_forwarded': self._metrics[_M_FORWARDED],
+            'bundles_delivered': self._metrics[_M_DELIVERED],
+            'bundles_expired': self._metrics[_M_EXPIRED]
         }
 
 if __name__ == "__main__":
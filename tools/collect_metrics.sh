@@ -29,8 +29,9 @@ import json
 import csv
 import sys
 
+# Delivery log is JSON Lines: one delivery record per line
 with open(sys.argv[1], 'r') as f:
-    deliveries = json.load(f)
+    deliveries = [json.loads(line) for line in f if line.strip()]
 
 with open(sys.argv[2], 'w', newline='') as f:
     writer = csv.writer(f)
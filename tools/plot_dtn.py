@@ -1,25 +1,37 @@
 #!/usr/bin/env python3
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
-import glob
 import sys
 from datetime import datetime
 
 def load_latest_csv():
     """Load the latest metrics CSV file"""
-    csv_files = glob.glob('results/delivery_metrics_*.csv')
-    
-    if not csv_files:
+    # Single directory scan; DirEntry.stat() reuses the stat from the
+    # listing instead of re-stat-ing every candidate like glob+getctime
+    latest_file = None
+    latest_ctime = -1.0
+    try:
+        with os.scandir('results') as entries:
+            for entry in entries:
+                if (entry.name.startswith('delivery_metrics_')
+                        and entry.name.endswith('.csv')):
+                    ctime = entry.stat().st_ctime
+                    if ctime > latest_ctime:
+                        latest_file, latest_ctime = entry.path, ctime
+    except FileNotFoundError:
+        pass
+
+    if latest_file is None:
         # Try symlink
         if os.path.exists('results/latest_metrics.csv'):
             return pd.read_csv('results/latest_metrics.csv')
         else:
             print("No CSV files found in results/")
             sys.exit(1)
-    
-    latest_file = max(csv_files, key=os.path.getctime)
+
     print(f"Loading: {latest_file}")
     return pd.read_csv(latest_file)
 
@@ -34,20 +46,22 @@ def create_plots(df):
     
     # Add sequence number based on order
     df['seq'] = range(1, len(df) + 1)
-    
+
+    # One float32 pass over the delay column covers every summary stat
+    arr = df['e2e_delay'].to_numpy(dtype=np.float32)
+    min_delay, median_delay, max_delay = np.quantile(arr, [0.0, 0.5, 1.0])
+    mean_delay = float(arr.mean())
+    std_delay = float(arr.std(ddof=1))
+
     # Figure 1: Line plot of E2E delay over sequence
     fig1, ax1 = plt.subplots(figsize=(10, 6))
-    ax1.plot(df['seq'], df['e2e_delay'], marker='o', linewidth=2, markersize=8, color='#3498db')
+    ax1.plot(df['seq'], arr, marker='o', linewidth=2, markersize=8, color='#3498db')
     ax1.set_xlabel('Bundle Sequence (Order Received)', fontsize=12)
     ax1.set_ylabel('Earth-Moon E2E Delay (seconds)', fontsize=12)
     ax1.set_title('Space DTN: Earth-Moon Communication Delay', fontsize=14, fontweight='bold')
     ax1.grid(True, alpha=0.3)
     
     # Add statistics annotation
-    mean_delay = df['e2e_delay'].mean()
-    max_delay = df['e2e_delay'].max()
-    min_delay = df['e2e_delay'].min()
-    
     stats_text = f'Mean: {mean_delay:.4f}s\nMax: {max_delay:.4f}s\nMin: {min_delay:.4f}s'
     ax1.text(0.02, 0.98, stats_text, transform=ax1.transAxes, 
              fontsize=10, verticalalignment='top',
@@ -57,9 +71,11 @@ def create_plots(df):
     plt.savefig('results/plots/line_e2e_delay.png', dpi=150)
     print("Saved: results/plots/line_e2e_delay.png")
     
-    # Figure 2: Histogram of E2E delays
+    # Figure 2: Histogram of E2E delays (binned once with numpy)
     fig2, ax2 = plt.subplots(figsize=(10, 6))
-    n, bins, patches = ax2.hist(df['e2e_delay'], bins=20, edgecolor='black', alpha=0.7)
+    counts, bins = np.histogram(arr, bins=20)
+    patches = ax2.bar(bins[:-1], counts, width=np.diff(bins), align='edge',
+                      edgecolor='black', alpha=0.7)
     
     # Color gradient for bars
     cm = plt.cm.viridis
@@ -81,17 +97,18 @@ def create_plots(df):
     # Figure 3: Bundle delivery analysis
     fig3, (ax3, ax4) = plt.subplots(1, 2, figsize=(14, 6))
     
-    # Calculate hop statistics
-    avg_hops = df['hop_count'].mean()
-    
+    # Calculate hop statistics on a compact integer array
+    hops = df['hop_count'].to_numpy(dtype=np.int16)
+    avg_hops = float(hops.mean())
+
     # Pie chart for hop count distribution
-    hop_counts = df['hop_count'].value_counts()
-    ax3.pie(hop_counts.values, labels=[f'{h} hops' for h in hop_counts.index], 
+    hop_values, hop_freqs = np.unique(hops, return_counts=True)
+    ax3.pie(hop_freqs, labels=[f'{h} hops' for h in hop_values], 
             autopct='%1.1f%%', startangle=90, colors=['#2ecc71', '#e74c3c', '#3498db'])
     ax3.set_title(f'Bundle Hop Distribution (Avg: {avg_hops:.1f})', fontsize=12, fontweight='bold')
     
     # Box plot for delay distribution
-    box = ax4.boxplot([df['e2e_delay']], patch_artist=True)
+    box = ax4.boxplot([arr], patch_artist=True)
     box['boxes'][0].set_facecolor('#3498db')
     ax4.set_ylabel('End-to-End Delay (seconds)', fontsize=12)
     ax4.set_xticklabels(['All Bundles'])
@@ -115,8 +132,8 @@ def create_plots(df):
     print("="*50)
     print(f"Total bundles received at Lunar Base: {len(df)}")
     print(f"Mean E2E delay: {mean_delay:.6f} seconds")
-    print(f"Median E2E delay: {df['e2e_delay'].median():.6f} seconds")
-    print(f"Std deviation: {df['e2e_delay'].std():.6f} seconds")
+    print(f"Median E2E delay: {median_delay:.6f} seconds")
+    print(f"Std deviation: {std_delay:.6f} seconds")
     print(f"Min delay: {min_delay:.6f} seconds")
     print(f"Max delay: {max_delay:.6f} seconds")
     print(f"Average hop count: {avg_hops:.1f}")